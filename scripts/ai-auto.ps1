@@ -90,13 +90,13 @@ if ($selectedStrategy -notin @("auto", "sequential", "parallel")) {
     throw "Invalid --strategy. Allowed: auto, sequential, parallel."
 }
 
-if ($selectedMode -notin @("orchestrate", "single", "chat")) {
-    throw "Invalid --mode. Allowed: orchestrate, single, chat."
+if ($selectedMode -notin @("orchestrate", "single", "chat", "daemon", "client")) {
+    throw "Invalid --mode. Allowed: orchestrate, single, chat, daemon, client."
 }
 
 $prompt = ($promptTokens -join " ").Trim()
-if (($selectedMode -ne "chat") -and [string]::IsNullOrWhiteSpace($prompt)) {
-    Write-Host "Usage: npm run ai:auto -- [print] [mode=orchestrate|single|chat] [tool=auto|codex|claude|agent] [strategy=auto|sequential|parallel] <your task>" -ForegroundColor Yellow
+if (($selectedMode -notin @("chat", "daemon")) -and [string]::IsNullOrWhiteSpace($prompt)) {
+    Write-Host "Usage: npm run ai:auto -- [print] [mode=orchestrate|single|chat|daemon|client] [tool=auto|codex|claude|agent] [strategy=auto|sequential|parallel] <your task>" -ForegroundColor Yellow
     exit 1
 }
 
@@ -129,6 +129,28 @@ if ($selectedMode -eq "chat") {
     throw "LangGraph runtime not found. Expected ai\\.venv\\Scripts\\python.exe and scripts\\ai-langgraph-orchestrator.py"
 }
 
+if ($selectedMode -eq "daemon") {
+    $pythonExe = Join-Path $repoRoot "ai\.venv\Scripts\python.exe"
+    $orchestratorScript = Join-Path $repoRoot "scripts\ai-langgraph-orchestrator.py"
+    if ((Test-Path $pythonExe) -and (Test-Path $orchestratorScript)) {
+        Write-Host "[ai:auto] mode=daemon"
+        & $pythonExe $orchestratorScript --daemon
+        exit $LASTEXITCODE
+    }
+    throw "LangGraph runtime not found. Expected ai\\.venv\\Scripts\\python.exe and scripts\\ai-langgraph-orchestrator.py"
+}
+
+if ($selectedMode -eq "client") {
+    $pythonExe = Join-Path $repoRoot "ai\.venv\Scripts\python.exe"
+    $orchestratorScript = Join-Path $repoRoot "scripts\ai-langgraph-orchestrator.py"
+    if ((Test-Path $pythonExe) -and (Test-Path $orchestratorScript)) {
+        Write-Host "[ai:auto] mode=client tool=$selectedTool strategy=$selectedStrategy"
+        & $pythonExe $orchestratorScript --client --tool $selectedTool --strategy $selectedStrategy $prompt
+        exit $LASTEXITCODE
+    }
+    throw "LangGraph runtime not found. Expected ai\\.venv\\Scripts\\python.exe and scripts\\ai-langgraph-orchestrator.py"
+}
+
 function Get-KeywordScore {
     param(
         [string]$Text,
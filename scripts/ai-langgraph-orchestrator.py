@@ -8,21 +8,66 @@ and switches tools during execution based on dependency order.
 from __future__ import annotations
 
 import argparse
+import functools
+import hashlib
+import heapq
+import hmac
+import http.client
+import ipaddress
+import itertools
 import json
 import os
+import re
+import secrets
+import signal
+import socket
 import subprocess
+import sys
 import tempfile
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from typing_extensions import TypedDict
 
 from langgraph.graph import END, START, StateGraph
 
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None  # type: ignore[assignment]
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - optional dependency
+    psutil = None  # type: ignore[assignment]
+
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+MAX_PARALLEL_STEPS = 4
+DEFAULT_STEP_MEMORY_MB = 1024
+RESOURCE_POLL_SEC = 0.5
+RLIMIT_CPU_GRACE_SEC = 2
+MB = 1024 * 1024
+DEFAULT_DAEMON_URL = "http://127.0.0.1:8765"
+MAX_FINISHED_JOBS = 200
+DAEMON_SHUTDOWN_SEC = 30.0
+DAEMON_TOKEN_HEADER = "X-Orchestrator-Token"
+STATE_DIR = REPO_ROOT / ".tmp" / "ai-orchestrator"
+STEP_COSTS_PATH = STATE_DIR / "step-costs.json"
+DEFAULT_STEP_COST_SEC = 120.0
+PLAN_STEP_PENALTY_SEC = 15.0
 
 
 class Step(TypedDict):
@@ -40,6 +85,10 @@ class CompletedStep(TypedDict):
     tool: str
     status: str
     output: str
+    elapsed_sec: float
+    cpu_sec: float
+    peak_rss_mb: float
+    validation: ValidationResult | None
 
 
 class OrchestratorState(TypedDict):
@@ -54,6 +103,21 @@ class OrchestratorState(TypedDict):
     max_iterations: int
     log: list[str]
     verbose: bool
+    resource_policy: ResourcePolicy
+    progress: Callable[[str], None] | None
+    planners: list[str]
+    plan_deadline_sec: float
+    validate: str
+    cancel: CancelToken
+
+
+@dataclass
+class ResourcePolicy:
+    """Per-step limits for tool processes (0 means unlimited)."""
+
+    max_memory_mb: int = 0
+    max_cpu_sec: int = 0
+    min_free_memory_mb: int = 1024
 
 
 @dataclass
@@ -61,6 +125,200 @@ class ToolResult:
     ok: bool
     output: str
     error: str
+    elapsed_sec: float = 0.0
+    cpu_sec: float = 0.0
+    peak_rss_mb: float = 0.0
+    cancelled: bool = False
+    breach: bool = False
+
+
+class CancelToken:
+    """Cooperative cancellation flag with an optional deadline.
+
+    run_cmd polls it while a tool runs and kills the whole process tree once
+    it fires; graph nodes check it between steps.
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._deadline: float | None = None
+        self.reason = ""
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    def set_deadline(self, seconds: float) -> None:
+        self._deadline = time.monotonic() + seconds
+
+    def remaining(self) -> float | None:
+        if self._deadline is None:
+            return None
+        return max(0.0, self._deadline - time.monotonic())
+
+    @property
+    def cancelled(self) -> bool:
+        if not self._event.is_set() and self._deadline is not None and time.monotonic() >= self._deadline:
+            self.cancel("deadline")
+        return self._event.is_set()
+
+    def wait(self, timeout_sec: float) -> bool:
+        remaining = self.remaining()
+        if remaining is not None:
+            timeout_sec = min(timeout_sec, remaining)
+        return self._event.wait(timeout_sec) or self.cancelled
+
+
+def available_memory_mb() -> float | None:
+    if psutil is not None:
+        return psutil.virtual_memory().available / MB
+    try:
+        for line in Path("/proc/meminfo").read_text(encoding="utf-8").splitlines():
+            if line.startswith("MemAvailable:"):
+                return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def process_sampler_available() -> bool:
+    """Whether sample_process_tree can measure tool processes on this host."""
+    return psutil is not None or Path("/proc").is_dir()
+
+
+def sample_process_tree(pid: int) -> tuple[float, float] | None:
+    """Return (rss_mb, cpu_sec) summed over a tool process and its descendants."""
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            procs = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return None
+        rss = 0.0
+        cpu = 0.0
+        for proc in procs:
+            try:
+                rss += proc.memory_info().rss / MB
+                times = proc.cpu_times()
+                cpu += times.user + times.system
+            except psutil.Error:
+                continue
+        return rss, cpu
+
+    proc_dir = Path("/proc")
+    if not proc_dir.is_dir():
+        return None
+    # Without psutil, fall back to the process group created by start_new_session.
+    page_mb = os.sysconf("SC_PAGE_SIZE") / MB
+    ticks = os.sysconf("SC_CLK_TCK")
+    rss = 0.0
+    cpu = 0.0
+    for entry in proc_dir.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text(encoding="utf-8", errors="replace")
+            fields = stat[stat.rindex(")") + 2 :].split()
+        except (OSError, ValueError):
+            continue
+        if int(fields[2]) != pid:
+            continue
+        cpu += (int(fields[11]) + int(fields[12])) / ticks
+        rss += int(fields[21]) * page_mb
+    return rss, cpu
+
+
+def create_step_cgroup(policy: ResourcePolicy) -> Path | None:
+    """Create a cgroup v2 child with memory.max when the hierarchy is delegated to us."""
+    if not policy.max_memory_mb or not (CGROUP_ROOT / "cgroup.controllers").exists():
+        return None
+    try:
+        own = Path("/proc/self/cgroup").read_text(encoding="utf-8").strip().splitlines()
+        rel = next(line.split("::", 1)[1] for line in own if line.startswith("0::"))
+        cgroup = CGROUP_ROOT / rel.lstrip("/") / f"ai-orchestrator-{os.getpid()}-{threading.get_ident()}"
+        cgroup.mkdir(exist_ok=True)
+    except (OSError, StopIteration):
+        return None
+    try:
+        (cgroup / "memory.max").write_text(str(policy.max_memory_mb * MB), encoding="utf-8")
+        (cgroup / "memory.swap.max").write_text("0", encoding="utf-8")
+    except FileNotFoundError:
+        # memory.swap.max is optional; memory.max missing means no memory controller.
+        if not (cgroup / "memory.max").exists():
+            remove_step_cgroup(cgroup)
+            return None
+    except OSError:
+        remove_step_cgroup(cgroup)
+        return None
+    return cgroup
+
+
+def remove_step_cgroup(cgroup: Path | None) -> None:
+    if cgroup is None:
+        return
+    try:
+        cgroup.rmdir()
+    except OSError:
+        pass
+
+
+def apply_child_limits(pid: int, policy: ResourcePolicy, cgroup: Path | None) -> None:
+    """Attach a freshly spawned tool process to its cgroup and CPU rlimit from the parent.
+
+    Done after Popen instead of via preexec_fn, which is unsafe while other
+    threads (parallel steps, planners, daemon workers) are running. The
+    PowerShell wrapper needs far longer to start than this takes, so its
+    children inherit both. RLIMIT_CPU only kills the single process that hits
+    it, so it sits a little above the sampled limit as a backstop; the
+    sampler is what reports the breach and kills the whole tree.
+    """
+    if cgroup is not None:
+        try:
+            (cgroup / "cgroup.procs").write_text(str(pid), encoding="utf-8")
+        except OSError:
+            pass
+    if resource is not None and policy.max_cpu_sec and hasattr(resource, "prlimit"):
+        try:
+            soft = policy.max_cpu_sec + RLIMIT_CPU_GRACE_SEC
+            resource.prlimit(pid, resource.RLIMIT_CPU, (soft, soft + RLIMIT_CPU_GRACE_SEC))
+        except (OSError, ValueError):
+            pass
+
+
+def limit_breach(policy: ResourcePolicy, peak_rss: float, cpu_sec: float) -> str:
+    if policy.max_memory_mb and peak_rss > policy.max_memory_mb:
+        return f"memory limit exceeded ({peak_rss:.0f}MB > {policy.max_memory_mb}MB)"
+    if policy.max_cpu_sec and cpu_sec > policy.max_cpu_sec:
+        return f"cpu limit exceeded ({cpu_sec:.1f}s > {policy.max_cpu_sec}s)"
+    return ""
+
+
+def kill_process_tree(proc: subprocess.Popen, cgroup: Path | None = None) -> None:
+    if cgroup is not None:
+        try:
+            (cgroup / "cgroup.kill").write_text("1", encoding="utf-8")
+        except OSError:
+            pass
+    if os.name == "posix":
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except OSError:
+            pass
+        return
+    subprocess.run(
+        ["taskkill", "/T", "/F", "/PID", str(proc.pid)],
+        capture_output=True,
+        check=False,
+    )
+    try:
+        proc.kill()
+    except OSError:
+        pass
+
+
+# Daemon-wide cap on concurrent tool processes; None outside --daemon.
+TOOL_SLOTS: threading.BoundedSemaphore | None = None
 
 
 def run_cmd(
@@ -68,35 +326,163 @@ def run_cmd(
     *,
     env: dict[str, str] | None = None,
     timeout_sec: int = 1800,
+    policy: ResourcePolicy | None = None,
+    cancel: CancelToken | None = None,
+    cwd: Path | None = None,
 ) -> ToolResult:
+    slots = TOOL_SLOTS
+    if slots is None:
+        return monitor_cmd(cmd, env=env, timeout_sec=timeout_sec, policy=policy, cancel=cancel, cwd=cwd)
+    # Every job, planner and validation shard competes for the same slots.
+    while not slots.acquire(timeout=RESOURCE_POLL_SEC):
+        if cancel is not None and cancel.cancelled:
+            return ToolResult(ok=False, output="", error=f"cancelled: {cancel.reason}", cancelled=True)
     try:
-        ps_parts = " ".join("'" + part.replace("'", "''") + "'" for part in cmd)
-        ps_script = (
-            "$ErrorActionPreference='Stop'; "
-            f"& {ps_parts}; "
-            "if ($LASTEXITCODE -ne $null) { exit $LASTEXITCODE } else { exit 0 }"
-        )
-        proc = subprocess.run(
+        return monitor_cmd(cmd, env=env, timeout_sec=timeout_sec, policy=policy, cancel=cancel, cwd=cwd)
+    finally:
+        slots.release()
+
+
+def monitor_cmd(
+    cmd: list[str],
+    *,
+    env: dict[str, str] | None,
+    timeout_sec: int,
+    policy: ResourcePolicy | None,
+    cancel: CancelToken | None,
+    cwd: Path | None,
+) -> ToolResult:
+    """Run one tool process tree, enforcing `policy` and `cancel` and measuring its usage."""
+    policy = policy or ResourcePolicy()
+    ps_parts = " ".join("'" + part.replace("'", "''") + "'" for part in cmd)
+    ps_script = (
+        "$ErrorActionPreference='Stop'; "
+        f"& {ps_parts}; "
+        "if ($LASTEXITCODE -ne $null) { exit $LASTEXITCODE } else { exit 0 }"
+    )
+    cgroup = create_step_cgroup(policy)
+    popen_kwargs: dict[str, Any] = {}
+    if os.name == "posix":
+        # Own process group so a breach can kill the whole tool tree at once.
+        popen_kwargs["start_new_session"] = True
+    started = time.monotonic()
+    try:
+        proc = subprocess.Popen(
             ["powershell", "-NoProfile", "-Command", ps_script],
-            cwd=REPO_ROOT,
+            cwd=cwd or REPO_ROOT,
             env=env,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True,
             encoding="utf-8",
             errors="replace",
-            timeout=timeout_sec,
-            check=False,
+            **popen_kwargs,
         )
-        out = (proc.stdout or "").strip()
-        err = (proc.stderr or "").strip()
-        if proc.returncode == 0:
-            return ToolResult(ok=True, output=out, error=err)
-        return ToolResult(ok=False, output=out, error=err or f"exit_code={proc.returncode}")
     except Exception as exc:  # pragma: no cover - defensive
+        remove_step_cgroup(cgroup)
         return ToolResult(ok=False, output="", error=str(exc))
+    if os.name == "posix":
+        apply_child_limits(proc.pid, policy, cgroup)
 
+    streams: dict[str, str] = {}
 
-def codex_exec(prompt: str, model: str = "gpt-5.3-codex") -> ToolResult:
+    def drain(name: str, pipe) -> None:
+        streams[name] = pipe.read()
+
+    readers = [
+        threading.Thread(target=drain, args=("out", proc.stdout), daemon=True),
+        threading.Thread(target=drain, args=("err", proc.stderr), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+
+    peak_rss = 0.0
+    cpu_sec = 0.0
+    breach = ""
+    cancelled = ""
+    usage = None
+    while True:
+        if os.name == "posix":
+            pid, wait_status, usage = os.wait4(proc.pid, os.WNOHANG)
+            if pid:
+                proc.returncode = os.waitstatus_to_exitcode(wait_status)
+                break
+        elif proc.poll() is not None:
+            break
+        sample = sample_process_tree(proc.pid)
+        if sample is not None:
+            peak_rss = max(peak_rss, sample[0])
+            cpu_sec = max(cpu_sec, sample[1])
+        if not breach and not cancelled and cancel is not None and cancel.cancelled:
+            cancelled = cancel.reason
+            kill_process_tree(proc, cgroup)
+        if not breach and not cancelled:
+            breach = limit_breach(policy, peak_rss, cpu_sec)
+            if not breach and time.monotonic() - started > timeout_sec:
+                breach = f"timeout after {timeout_sec}s"
+            if breach:
+                kill_process_tree(proc, cgroup)
+        # Once the token has fired its wait() returns at once; fall back to sleeping while the kill lands.
+        if cancel is not None and not cancel.cancelled:
+            cancel.wait(RESOURCE_POLL_SEC)
+        else:
+            time.sleep(RESOURCE_POLL_SEC)
+
+    if usage is not None:
+        # ru_maxrss is KiB on Linux and bytes on macOS.
+        maxrss_mb = usage.ru_maxrss / MB if sys.platform == "darwin" else usage.ru_maxrss / 1024
+        peak_rss = max(peak_rss, maxrss_mb)
+        cpu_sec = max(cpu_sec, usage.ru_utime + usage.ru_stime)
+    if not breach and not cancelled:
+        # The wrapper can exit between samples (or be killed by RLIMIT_CPU, SIGXCPU)
+        # before the loop sees the breach; judge its final usage and kill what it left behind.
+        breach = limit_breach(policy, peak_rss, cpu_sec)
+        if breach:
+            kill_process_tree(proc, cgroup)
+
+    for reader in readers:
+        reader.join()
+    elapsed = time.monotonic() - started
+    if cgroup is not None:
+        try:
+            cgroup_peak = int((cgroup / "memory.peak").read_text(encoding="utf-8").strip()) / MB
+            peak_rss = max(peak_rss, cgroup_peak)
+        except (OSError, ValueError):
+            pass
+        if not breach:
+            try:
+                events = dict(
+                    line.split(maxsplit=1)
+                    for line in (cgroup / "memory.events").read_text(encoding="utf-8").splitlines()
+                    if line.strip()
+                )
+                if int(events.get("oom_kill", "0")) > 0:
+                    breach = f"memory limit exceeded (cgroup oom_kill at {policy.max_memory_mb}MB)"
+            except (OSError, ValueError):
+                pass
+    remove_step_cgroup(cgroup)
+
+    out = (streams.get("out") or "").strip()
+    err = (streams.get("err") or "").strip()
+    metrics = {"elapsed_sec": elapsed, "cpu_sec": cpu_sec, "peak_rss_mb": peak_rss}
+    if cancelled:
+        return ToolResult(ok=False, output=out, error=f"cancelled: {cancelled}", cancelled=True, **metrics)
+    if breach:
+        return ToolResult(
+            ok=False, output=out, error=f"resource_limit: {breach}\n{err}".strip(), breach=True, **metrics
+        )
+    if proc.returncode == 0:
+        return ToolResult(ok=True, output=out, error=err, **metrics)
+    return ToolResult(ok=False, output=out, error=err or f"exit_code={proc.returncode}", **metrics)
+
+
+def codex_exec(
+    prompt: str,
+    model: str = "gpt-5.3-codex",
+    *,
+    policy: ResourcePolicy | None = None,
+    cancel: CancelToken | None = None,
+) -> ToolResult:
     with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as tmp:
         msg_file = tmp.name
     dangerous = os.environ.get("AI_AUTO_DANGEROUS_BYPASS", "").strip().lower() in {
@@ -120,7 +506,7 @@ def codex_exec(prompt: str, model: str = "gpt-5.3-codex") -> ToolResult:
         msg_file,
         prompt,
     ]
-    result = run_cmd(cmd)
+    result = run_cmd(cmd, policy=policy, cancel=cancel)
     try:
         text = Path(msg_file).read_text(encoding="utf-8", errors="replace").strip()
     except Exception:
@@ -131,21 +517,33 @@ def codex_exec(prompt: str, model: str = "gpt-5.3-codex") -> ToolResult:
         except Exception:
             pass
     if text:
-        return ToolResult(ok=result.ok, output=text, error=result.error)
+        return replace(result, output=text)
     return result
 
 
-def claude_exec(prompt: str, model: str = "sonnet") -> ToolResult:
+def claude_exec(
+    prompt: str,
+    model: str = "sonnet",
+    *,
+    policy: ResourcePolicy | None = None,
+    cancel: CancelToken | None = None,
+) -> ToolResult:
     env = os.environ.copy()
     # Local Claude auth can work even if stale ANTHROPIC_API_KEY is present.
     env.pop("ANTHROPIC_API_KEY", None)
     cmd = ["claude", "-p", "--model", model, prompt]
-    return run_cmd(cmd, env=env)
+    return run_cmd(cmd, env=env, policy=policy, cancel=cancel)
 
 
-def agent_exec(prompt: str, model: str = "gpt-5.2") -> ToolResult:
+def agent_exec(
+    prompt: str,
+    model: str = "gpt-5.2",
+    *,
+    policy: ResourcePolicy | None = None,
+    cancel: CancelToken | None = None,
+) -> ToolResult:
     cmd = ["agent", "--print", "--model", model, prompt]
-    return run_cmd(cmd)
+    return run_cmd(cmd, policy=policy, cancel=cancel)
 
 
 def infer_tool_for_task(task_text: str) -> str:
@@ -297,12 +695,118 @@ def model_for_tool(tool: str) -> str:
     return "gpt-5.2"
 
 
-def execute_tool(tool: str, prompt: str) -> ToolResult:
+class ToolCassette:
+    """JSONL log of execute_tool calls, written by --record and served by --replay.
+
+    Replay matches the exact (tool, prompt) first, then the next unused
+    response recorded for the same label (plan / step id), so prompt and
+    routing changes can still be exercised against a recorded session.
+    Cancelled responses (deadline-killed planners, interrupted steps) are
+    only served to an exact match, never through the label fallback.
+    """
+
+    def __init__(self, path: Path, *, replay: bool, latency_scale: float = 0.0) -> None:
+        self.path = path
+        self.replaying = replay
+        self.latency_scale = max(0.0, latency_scale)
+        self._lock = threading.Lock()
+        self._entries: list[dict[str, Any]] = []
+        self._used: set[int] = set()
+        self._by_prompt: dict[tuple[str, str], deque[int]] = {}
+        self._by_label: dict[str, deque[int]] = {}
+        if replay:
+            for line in path.read_text(encoding="utf-8").splitlines():
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                idx = len(self._entries)
+                self._entries.append(entry)
+                self._by_prompt.setdefault((entry["tool"], entry["prompt_sha"]), deque()).append(idx)
+                if not entry.get("cancelled"):
+                    self._by_label.setdefault(entry.get("label", ""), deque()).append(idx)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def prompt_sha(prompt: str) -> str:
+        return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
+
+    def record(self, tool: str, label: str, prompt: str, result: ToolResult) -> None:
+        entry = {
+            "tool": tool,
+            "label": label,
+            "prompt_sha": self.prompt_sha(prompt),
+            "ok": result.ok,
+            "output": result.output,
+            "error": result.error,
+            "elapsed_sec": round(result.elapsed_sec, 3),
+            "cpu_sec": round(result.cpu_sec, 3),
+            "peak_rss_mb": round(result.peak_rss_mb, 1),
+            "cancelled": result.cancelled,
+            "breach": result.breach,
+        }
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            with self.path.open("a", encoding="utf-8") as fh:
+                fh.write(line + "\n")
+
+    def _take(self, queue: deque[int] | None) -> dict[str, Any] | None:
+        while queue:
+            idx = queue.popleft()
+            if idx not in self._used:
+                self._used.add(idx)
+                return self._entries[idx]
+        return None
+
+    def replay(self, tool: str, label: str, prompt: str, cancel: CancelToken | None = None) -> ToolResult:
+        with self._lock:
+            entry = self._take(self._by_prompt.get((tool, self.prompt_sha(prompt))))
+            if entry is None:
+                entry = self._take(self._by_label.get(label))
+        if entry is None:
+            return ToolResult(ok=False, output="", error=f"[replay] no recorded response for tool={tool} label={label}")
+        if self.latency_scale:
+            delay = entry.get("elapsed_sec", 0.0) * self.latency_scale
+            if cancel is not None:
+                if cancel.wait(delay):
+                    return ToolResult(ok=False, output="", error=f"cancelled: {cancel.reason}", cancelled=True)
+            else:
+                time.sleep(delay)
+        return ToolResult(
+            ok=bool(entry["ok"]),
+            output=entry.get("output", ""),
+            error=entry.get("error", ""),
+            elapsed_sec=entry.get("elapsed_sec", 0.0),
+            cpu_sec=entry.get("cpu_sec", 0.0),
+            peak_rss_mb=entry.get("peak_rss_mb", 0.0),
+            cancelled=bool(entry.get("cancelled", False)),
+            breach=bool(entry.get("breach", False)),
+        )
+
+
+ACTIVE_CASSETTE: ToolCassette | None = None
+
+
+def execute_tool(
+    tool: str,
+    prompt: str,
+    *,
+    label: str = "",
+    policy: ResourcePolicy | None = None,
+    cancel: CancelToken | None = None,
+) -> ToolResult:
+    cassette = ACTIVE_CASSETTE
+    if cassette is not None and cassette.replaying:
+        return cassette.replay(tool, label, prompt, cancel)
     if tool == "codex":
-        return codex_exec(prompt, model=model_for_tool("codex"))
-    if tool == "claude":
-        return claude_exec(prompt, model=model_for_tool("claude"))
-    return agent_exec(prompt, model=model_for_tool("agent"))
+        result = codex_exec(prompt, model=model_for_tool("codex"), policy=policy, cancel=cancel)
+    elif tool == "claude":
+        result = claude_exec(prompt, model=model_for_tool("claude"), policy=policy, cancel=cancel)
+    else:
+        result = agent_exec(prompt, model=model_for_tool("agent"), policy=policy, cancel=cancel)
+    if cassette is not None:
+        cassette.record(tool, label, prompt, result)
+    return result
 
 
 def resolve_step_tool(step: Step) -> str:
@@ -332,11 +836,147 @@ def has_blocker_signal(text: str) -> bool:
     return any(pattern in lower for pattern in blocker_patterns)
 
 
+def load_step_costs() -> dict[str, float]:
+    try:
+        raw = json.loads(STEP_COSTS_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return {tool: float(item["mean_sec"]) for tool, item in raw.items() if isinstance(item, dict) and "mean_sec" in item}
+
+
+_STEP_COSTS_LOCK = threading.Lock()
+
+
+def record_step_costs(completed: list[CompletedStep]) -> None:
+    """Fold successful step durations into the per-tool moving average used by plan scoring."""
+    samples = [(s["tool"], s["elapsed_sec"]) for s in completed if s["status"] == "ok" and s["elapsed_sec"] > 0]
+    if not samples:
+        return
+    with _STEP_COSTS_LOCK:
+        try:
+            raw = json.loads(STEP_COSTS_PATH.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            raw = {}
+        for tool, elapsed in samples:
+            item = raw.get(tool) if isinstance(raw.get(tool), dict) else {"mean_sec": elapsed, "samples": 0}
+            samples_seen = int(item.get("samples", 0))
+            # Exponential moving average once enough samples exist, so costs track recent behaviour.
+            weight = 1.0 / (samples_seen + 1) if samples_seen < 10 else 0.1
+            item["mean_sec"] = round(float(item["mean_sec"]) + (elapsed - float(item["mean_sec"])) * weight, 2)
+            item["samples"] = samples_seen + 1
+            raw[tool] = item
+        try:
+            STATE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp = STEP_COSTS_PATH.with_suffix(".tmp")
+            tmp.write_text(json.dumps(raw, indent=2), encoding="utf-8")
+            tmp.replace(STEP_COSTS_PATH)
+        except OSError:
+            pass
+
+
+def score_plan(plan: list[Step], forced_strategy: str, step_costs: dict[str, float]) -> dict[str, float]:
+    """Estimate plan duration by replaying pick/run batching with historical per-tool costs."""
+    cost = {s["id"]: step_costs.get(resolve_step_tool(s), DEFAULT_STEP_COST_SEC) for s in plan}
+    by_id = {s["id"]: s for s in plan}
+
+    finish: dict[str, float] = {}
+    visiting: set[str] = set()
+
+    def chain_cost(sid: str) -> float:
+        if sid in finish:
+            return finish[sid]
+        if sid in visiting:
+            raise ValueError("dependency cycle")
+        visiting.add(sid)
+        start = max((chain_cost(dep) for dep in by_id[sid]["depends_on"]), default=0.0)
+        visiting.discard(sid)
+        finish[sid] = start + cost[sid]
+        return finish[sid]
+
+    try:
+        critical = max((chain_cost(s["id"]) for s in plan), default=0.0)
+    except ValueError:
+        return {"critical_path_sec": float("inf"), "width": 0, "makespan_sec": float("inf"), "score": float("inf")}
+
+    done: set[str] = set()
+    makespan = 0.0
+    width = 0
+    while len(done) < len(plan):
+        pending = [s for s in plan if s["id"] not in done]
+        ready = [s for s in pending if all(dep in done for dep in s["depends_on"])]
+        if not ready:
+            return {"critical_path_sec": critical, "width": width, "makespan_sec": float("inf"), "score": float("inf")}
+        active = select_active_steps(ready, forced_strategy)
+        batch = [cost[s["id"]] for s in active]
+        makespan += max(max(batch), sum(batch) / MAX_PARALLEL_STEPS)
+        width = max(width, len(active))
+        done.update(s["id"] for s in active)
+
+    return {
+        "critical_path_sec": critical,
+        "width": width,
+        "makespan_sec": makespan,
+        "score": makespan + PLAN_STEP_PENALTY_SEC * len(plan),
+    }
+
+
+def run_planner_ensemble(
+    prompt: str,
+    planners: list[str],
+    *,
+    deadline_sec: float,
+    policy: ResourcePolicy | None,
+    cancel: CancelToken | None = None,
+) -> list[tuple[str, dict[str, Any]]]:
+    """Ask every planner concurrently; return valid plans received before the deadline."""
+    tokens = {tool: CancelToken() for tool in planners}
+    pool = ThreadPoolExecutor(max_workers=len(planners))
+    futures = {
+        pool.submit(execute_tool, tool, prompt, label="plan", policy=policy, cancel=tokens[tool]): tool
+        for tool in planners
+    }
+    candidates: list[tuple[str, dict[str, Any]]] = []
+    deadline = time.monotonic() + deadline_sec
+    pending: set[Future] = set(futures)
+    try:
+        while pending:
+            if cancel is not None and cancel.cancelled:
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=min(RESOURCE_POLL_SEC, remaining), return_when=FIRST_COMPLETED)
+            for fut in done:
+                raw = extract_json_object(fut.result().output)
+                if raw and isinstance(raw.get("steps"), list) and raw["steps"]:
+                    candidates.append((futures[fut], raw))
+    finally:
+        reason = cancel.reason if cancel is not None and cancel.cancelled else "plan deadline"
+        for fut in pending:
+            tokens[futures[fut]].cancel(reason)
+        pool.shutdown(wait=False, cancel_futures=True)
+    order = {tool: idx for idx, tool in enumerate(planners)}
+    return sorted(candidates, key=lambda item: order[item[0]])
+
+
+def report(state: OrchestratorState, line: str) -> None:
+    if state.get("verbose", True):
+        print(line, flush=True)
+    progress = state.get("progress")
+    if progress is not None:
+        progress(line)
+
+
 def plan_node(state: OrchestratorState) -> dict[str, Any]:
     task = state["task"]
     forced_tool = state["forced_tool"]
     forced_strategy = state["forced_strategy"]
-    verbose = state.get("verbose", True)
+    validation_rule = ""
+    if state.get("validate", "off") == "impacted":
+        validation_rule = (
+            "- Do not add steps that only re-run test suites: impacted backend/mobile tests run "
+            "automatically after every code-changing step.\n"
+        )
 
     planner_prompt = f"""
 You are an orchestration planner.
@@ -365,31 +1005,89 @@ Rules:
   - codex: code edits, tests, terminal-heavy debugging
   - claude: architecture/research/spec decomposition
   - agent: second-pass validation or alternative implementation checks
-- Prefer execution="auto" unless you have a strong reason to force sequential/parallel.
+{validation_rule}- Prefer execution="auto" unless you have a strong reason to force sequential/parallel.
 - Prefer parallel only for independent steps.
 - Steps must be dependency-safe.
 """.strip()
 
-    plan_result = codex_exec(planner_prompt, model="gpt-5.3-codex")
-    plan_json = extract_json_object(plan_result.output)
-    if not plan_json:
-        plan_json = {}
-    plan = normalize_plan(plan_json, task, forced_tool, forced_strategy)
+    planners = state.get("planners") or ["codex"]
+    log_entries: list[str] = []
+    if len(planners) == 1:
+        plan_result = execute_tool(
+            planners[0],
+            planner_prompt,
+            label="plan",
+            policy=state["resource_policy"],
+            cancel=state["cancel"],
+        )
+        plan_json = extract_json_object(plan_result.output)
+        if not plan_json:
+            plan_json = {}
+        plan = normalize_plan(plan_json, task, forced_tool, forced_strategy)
+    else:
+        candidates = run_planner_ensemble(
+            planner_prompt,
+            planners,
+            deadline_sec=state["plan_deadline_sec"],
+            policy=state["resource_policy"],
+            cancel=state["cancel"],
+        )
+        step_costs = load_step_costs()
+        scored: list[tuple[float, str, list[Step]]] = []
+        for tool, raw in candidates:
+            candidate = normalize_plan(raw, task, forced_tool, forced_strategy)
+            score = score_plan(candidate, forced_strategy, step_costs)
+            entry = (
+                f"[plan] candidate {tool}: steps={len(candidate)} critical={score['critical_path_sec']:.0f}s "
+                f"width={score['width']:.0f} makespan={score['makespan_sec']:.0f}s score={score['score']:.0f}"
+            )
+            report(state, entry)
+            log_entries.append(entry)
+            scored.append((score["score"], tool, candidate))
+        missing = [t for t in planners if t not in {tool for tool, _ in candidates}]
+        if missing:
+            entry = f"[plan] no valid plan from: {','.join(missing)}"
+            report(state, entry)
+            log_entries.append(entry)
+        if scored:
+            # min() keeps planner order on ties, so the first listed planner wins.
+            _, chosen_tool, plan = min(scored, key=lambda item: item[0])
+            entry = f"[plan] selected {chosen_tool}"
+            report(state, entry)
+            log_entries.append(entry)
+        else:
+            plan = normalize_plan({}, task, forced_tool, forced_strategy)
 
     log_entry = f"[plan] generated {len(plan)} steps"
-    if verbose:
-        print(log_entry, flush=True)
+    report(state, log_entry)
     return {
         "plan": plan,
         "status": "running",
         "iteration": 0,
         "completed_steps": [],
         "active_steps": [],
-        "log": state["log"] + [log_entry],
+        "log": state["log"] + log_entries + [log_entry],
     }
 
 
+def select_active_steps(ready: list[Step], forced_strategy: str) -> list[Step]:
+    if forced_strategy == "parallel":
+        return ready
+    if forced_strategy == "sequential":
+        return [ready[0]]
+    sequential_ready = [s for s in ready if s["execution"] == "sequential"]
+    if sequential_ready:
+        return [sequential_ready[0]]
+    return ready
+
+
 def pick_node(state: OrchestratorState) -> dict[str, Any]:
+    cancel = state["cancel"]
+    if cancel.cancelled:
+        log_entry = f"[pick] run cancelled ({cancel.reason})"
+        report(state, log_entry)
+        return {"status": "cancelled", "active_steps": [], "log": state["log"] + [log_entry]}
+
     plan = state["plan"]
     completed_ids = {s["id"] for s in state["completed_steps"]}
     pending = [s for s in plan if s["id"] not in completed_ids]
@@ -404,22 +1102,11 @@ def pick_node(state: OrchestratorState) -> dict[str, Any]:
     if not ready:
         return {"status": "error", "active_steps": [], "log": state["log"] + ["[pick] dependency deadlock"]}
 
-    forced_strategy = state["forced_strategy"]
-    if forced_strategy == "parallel":
-        active = ready
-    elif forced_strategy == "sequential":
-        active = [ready[0]]
-    else:
-        sequential_ready = [s for s in ready if s["execution"] == "sequential"]
-        if sequential_ready:
-            active = [sequential_ready[0]]
-        else:
-            active = ready
+    active = select_active_steps(ready, state["forced_strategy"])
 
     ids = ",".join(s["id"] for s in active)
     log_entry = f"[pick] active={ids}"
-    if state.get("verbose", True):
-        print(log_entry, flush=True)
+    report(state, log_entry)
     return {"active_steps": active, "status": "running", "log": state["log"] + [log_entry]}
 
 
@@ -455,19 +1142,301 @@ Execution requirements:
 """.strip()
 
 
-def run_one_step(task: str, step: Step, completed: list[CompletedStep]) -> CompletedStep:
-    prompt = make_step_prompt(task, step, completed)
+BACKEND_DIR = REPO_ROOT / "backend"
+MOBILE_DIR = REPO_ROOT / "mobile"
+IMPORT_GRAPH_PATH = STATE_DIR / "import-graph.json"
+TS_IMPORT_RE = re.compile(
+    r"""(?:\bfrom\s+|\bimport\s+|\bimport\(\s*|\brequire\(\s*|\bjest\.mock\(\s*)['"](\.{1,2}/[^'"]+)['"]"""
+)
+DART_IMPORT_RE = re.compile(r"""^\s*(?:import|export|part)\s+['"]([^'"]+)['"]""", re.MULTILINE)
+# Changes to these files can affect every test of the suite.
+BACKEND_SUITE_FILES = {"backend/package.json", "backend/jest.config.js", "backend/jest.setup.ts", "backend/tsconfig.json"}
+MOBILE_SUITE_FILES = {"mobile/pubspec.yaml", "mobile/analysis_options.yaml"}
+
+
+class ValidationShard(TypedDict):
+    suite: str
+    tests: list[str]
+    ok: bool
+    elapsed_sec: float
+    output: str
+
+
+class ValidationResult(TypedDict):
+    status: str
+    changed_files: list[str]
+    tests: list[str]
+    shards: list[ValidationShard]
+
+
+def git_output(args: list[str]) -> str | None:
+    try:
+        proc = subprocess.run(["git", *args], cwd=REPO_ROOT, capture_output=True, check=False)
+    except OSError:
+        return None
+    if proc.returncode != 0:
+        return None
+    return proc.stdout.decode("utf-8", errors="replace")
+
+
+def worktree_snapshot() -> tuple[str, dict[str, str]]:
+    """Return HEAD and a map of every modified/untracked path to a content hash (or "deleted")."""
+    head = (git_output(["rev-parse", "HEAD"]) or "").strip()
+    try:
+        proc = subprocess.run(
+            ["git", "status", "--porcelain", "-z", "-uall"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            check=False,
+        )
+    except OSError:
+        return head, {}
+    if proc.returncode != 0:
+        return head, {}
+    snapshot: dict[str, str] = {}
+    entries = proc.stdout.decode("utf-8", errors="replace").split("\0")
+    idx = 0
+    while idx < len(entries):
+        entry = entries[idx]
+        idx += 1
+        if len(entry) < 4:
+            continue
+        status, path = entry[:2], entry[3:]
+        if "R" in status or "C" in status:
+            idx += 1  # rename/copy source path follows
+        if path.startswith(".tmp/"):
+            continue
+        try:
+            snapshot[path] = hashlib.sha1((REPO_ROOT / path).read_bytes()).hexdigest()
+        except OSError:
+            snapshot[path] = "deleted"
+    return head, snapshot
+
+
+def changed_between(before: tuple[str, dict[str, str]], after: tuple[str, dict[str, str]]) -> list[str]:
+    head_before, files_before = before
+    head_after, files_after = after
+    changed = {path for path in set(files_before) | set(files_after) if files_before.get(path) != files_after.get(path)}
+    if head_before and head_after and head_before != head_after:
+        # Agents often commit their edits, which hides them from git status.
+        committed = git_output(["diff", "--name-only", "-z", head_before, head_after]) or ""
+        changed.update(path for path in committed.split("\0") if path and not path.startswith(".tmp/"))
+    return sorted(changed)
+
+
+def is_backend_test(path: str) -> bool:
+    return path.startswith("backend/src/") and path.endswith(".test.ts")
+
+
+def is_mobile_test(path: str) -> bool:
+    return path.startswith("mobile/test/") and path.endswith("_test.dart")
+
+
+def resolve_ts_import(source: str, spec: str) -> str | None:
+    base = (REPO_ROOT / source).parent / spec
+    for candidate in [base, base.with_name(base.name + ".ts"), base.with_name(base.name + ".tsx"), base / "index.ts"]:
+        if candidate.is_file():
+            return candidate.resolve().relative_to(REPO_ROOT).as_posix()
+    return None
+
+
+def resolve_dart_import(source: str, spec: str, package: str) -> str | None:
+    if spec.startswith("dart:"):
+        return None
+    if spec.startswith("package:"):
+        prefix = f"package:{package}/"
+        if not spec.startswith(prefix):
+            return None
+        target = MOBILE_DIR / "lib" / spec[len(prefix) :]
+    else:
+        target = (REPO_ROOT / source).parent / spec
+    try:
+        return target.resolve().relative_to(REPO_ROOT).as_posix()
+    except ValueError:
+        return None
+
+
+def mobile_package_name() -> str:
+    try:
+        for line in (MOBILE_DIR / "pubspec.yaml").read_text(encoding="utf-8").splitlines():
+            if line.startswith("name:"):
+                return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return "runterra"
+
+
+_IMPORT_GRAPH_LOCK = threading.Lock()
+
+
+def load_import_graph() -> dict[str, list[str]]:
+    """Return file -> imported files for backend/src and mobile, reparsing only files that changed."""
+    with _IMPORT_GRAPH_LOCK:
+        try:
+            cached = json.loads(IMPORT_GRAPH_PATH.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            cached = {}
+        package = mobile_package_name()
+        sources = list((BACKEND_DIR / "src").rglob("*.ts")) if (BACKEND_DIR / "src").is_dir() else []
+        for sub in ["lib", "test"]:
+            if (MOBILE_DIR / sub).is_dir():
+                sources += list((MOBILE_DIR / sub).rglob("*.dart"))
+
+        index: dict[str, dict[str, Any]] = {}
+        dirty = False
+        for source_path in sources:
+            rel = source_path.relative_to(REPO_ROOT).as_posix()
+            stat = source_path.stat()
+            key = f"{stat.st_mtime_ns}:{stat.st_size}"
+            entry = cached.get(rel)
+            if isinstance(entry, dict) and entry.get("key") == key:
+                index[rel] = entry
+                continue
+            text = source_path.read_text(encoding="utf-8", errors="replace")
+            if rel.endswith(".dart"):
+                resolved = [resolve_dart_import(rel, spec, package) for spec in DART_IMPORT_RE.findall(text)]
+            else:
+                resolved = [resolve_ts_import(rel, spec) for spec in TS_IMPORT_RE.findall(text)]
+            index[rel] = {"key": key, "imports": sorted({r for r in resolved if r})}
+            dirty = True
+
+        if dirty or len(index) != len(cached):
+            try:
+                STATE_DIR.mkdir(parents=True, exist_ok=True)
+                tmp = IMPORT_GRAPH_PATH.with_suffix(".tmp")
+                tmp.write_text(json.dumps(index, separators=(",", ":")), encoding="utf-8")
+                tmp.replace(IMPORT_GRAPH_PATH)
+            except OSError:
+                pass
+        return {rel: entry["imports"] for rel, entry in index.items()}
+
+
+def impacted_tests(changed: list[str], graph: dict[str, list[str]]) -> list[str]:
+    importers: dict[str, list[str]] = {}
+    for source, imports in graph.items():
+        for target in imports:
+            importers.setdefault(target, []).append(source)
+
+    # Deleted/renamed files are gone from the graph but their cached importers still list them.
+    seeds = [
+        path for path in changed if path in graph or path in importers or is_backend_test(path) or is_mobile_test(path)
+    ]
+    if any(path in BACKEND_SUITE_FILES for path in changed):
+        seeds += [path for path in graph if is_backend_test(path)]
+    if any(path in MOBILE_SUITE_FILES for path in changed):
+        seeds += [path for path in graph if is_mobile_test(path)]
+
+    seen = set(seeds)
+    queue = deque(seeds)
+    while queue:
+        for importer in importers.get(queue.popleft(), []):
+            if importer not in seen:
+                seen.add(importer)
+                queue.append(importer)
+    return sorted(path for path in seen if (is_backend_test(path) or is_mobile_test(path)) and (REPO_ROOT / path).is_file())
+
+
+def run_validation_shard(
+    suite: str,
+    tests: list[str],
+    policy: ResourcePolicy | None,
+    cancel: CancelToken | None = None,
+) -> ValidationShard:
+    if suite == "backend":
+        rel = [Path(t).relative_to("backend").as_posix() for t in tests]
+        cmd = ["npx", "jest", "--runInBand", "--runTestsByPath", *rel]
+        cwd = BACKEND_DIR
+    else:
+        rel = [Path(t).relative_to("mobile").as_posix() for t in tests]
+        cmd = ["flutter", "test", *rel]
+        cwd = MOBILE_DIR
+    result = run_cmd(cmd, cwd=cwd, policy=policy, cancel=cancel)
+    output = "\n".join(part for part in [result.output, result.error] if part)
+    return ValidationShard(
+        suite=suite,
+        tests=tests,
+        ok=result.ok,
+        elapsed_sec=result.elapsed_sec,
+        output=output[-2000:],
+    )
+
+
+def validate_changes(
+    changed: list[str],
+    policy: ResourcePolicy | None,
+    cancel: CancelToken | None = None,
+) -> ValidationResult:
+    """Run only the backend/mobile tests reachable from `changed` through the import graph."""
+    tests = impacted_tests(changed, load_import_graph())
+    if not tests:
+        return ValidationResult(status="skipped", changed_files=changed, tests=[], shards=[])
+
+    backend = [t for t in tests if is_backend_test(t)]
+    mobile = [t for t in tests if is_mobile_test(t)]
+    shards: list[tuple[str, list[str]]] = []
+    if backend:
+        count = min(MAX_PARALLEL_STEPS, len(backend))
+        shards += [("backend", backend[i::count]) for i in range(count)]
+    if mobile:
+        # flutter test parallelises files itself and holds a startup lock, so one shard.
+        shards.append(("mobile", mobile))
+
+    if cancel is not None and cancel.cancelled:
+        return ValidationResult(status="cancelled", changed_files=changed, tests=tests, shards=[])
+    with ThreadPoolExecutor(max_workers=len(shards)) as pool:
+        results = list(pool.map(lambda shard: run_validation_shard(shard[0], shard[1], policy, cancel), shards))
+    if cancel is not None and cancel.cancelled:
+        status = "cancelled"
+    else:
+        status = "passed" if all(r["ok"] for r in results) else "failed"
+    return ValidationResult(status=status, changed_files=changed, tests=tests, shards=results)
+
+
+def run_one_step(
+    task: str,
+    step: Step,
+    completed: list[CompletedStep],
+    policy: ResourcePolicy | None = None,
+    cancel: CancelToken | None = None,
+) -> CompletedStep:
     primary_tool = resolve_step_tool(step)
-    result = execute_tool(primary_tool, prompt)
+    if cancel is not None and cancel.cancelled:
+        # Queued behind a parallel batch when the run was cancelled: never start it.
+        return CompletedStep(
+            id=step["id"],
+            title=step["title"],
+            tool=primary_tool,
+            status="cancelled",
+            output=f"[orchestrator_note]\nStep not started: run cancelled ({cancel.reason}).",
+            elapsed_sec=0.0,
+            cpu_sec=0.0,
+            peak_rss_mb=0.0,
+            validation=None,
+        )
+
+    prompt = make_step_prompt(task, step, completed)
+    result = execute_tool(primary_tool, prompt, label=step["id"], policy=policy, cancel=cancel)
 
     used_tool = primary_tool
     status = "ok" if result.ok else "failed"
     output_text = result.output.strip() or result.error.strip()
-
-    # Fallback to codex if chosen tool failed.
-    if (not result.ok) and primary_tool != "codex":
-        fallback = codex_exec(prompt, model="gpt-5.3-codex")
-        if fallback.ok and fallback.output.strip():
+    elapsed_sec = result.elapsed_sec
+    cpu_sec = result.cpu_sec
+    peak_rss_mb = result.peak_rss_mb
+
+    # Fallback to codex if chosen tool failed. Not after a resource-limit breach:
+    # re-running the step right away would double the load the policy caps.
+    if result.cancelled:
+        status = "cancelled"
+    elif (not result.ok) and not result.breach and primary_tool != "codex":
+        fallback = execute_tool("codex", prompt, label=step["id"], policy=policy, cancel=cancel)
+        elapsed_sec += fallback.elapsed_sec
+        cpu_sec += fallback.cpu_sec
+        peak_rss_mb = max(peak_rss_mb, fallback.peak_rss_mb)
+        if fallback.cancelled:
+            status = "cancelled"
+            output_text = f"{output_text}\n\n[fallback_codex_error]\n{fallback.error.strip()}"
+        elif fallback.ok and fallback.output.strip():
             used_tool = "codex"
             status = "ok"
             output_text = fallback.output.strip()
@@ -484,9 +1453,59 @@ def run_one_step(task: str, step: Step, completed: list[CompletedStep]) -> Compl
         tool=used_tool,
         status=status,
         output=output_text,
+        elapsed_sec=elapsed_sec,
+        cpu_sec=cpu_sec,
+        peak_rss_mb=peak_rss_mb,
+        validation=None,
     )
 
 
+def validate_batch(
+    results: list[CompletedStep],
+    before: tuple[str, dict[str, str]],
+    policy: ResourcePolicy | None,
+    cancel: CancelToken | None,
+) -> None:
+    """Validate a batch's combined changes once and attach the result to its successful steps.
+
+    Steps of one batch share the worktree, so their edits cannot be told
+    apart; validating per step would blame a step for a sibling's change.
+    """
+    ok_steps = [r for r in results if r["status"] == "ok"]
+    if not ok_steps:
+        return
+    changed = changed_between(before, worktree_snapshot())
+    if changed:
+        validation = validate_changes(changed, policy, cancel)
+    else:
+        validation = ValidationResult(status="skipped", changed_files=[], tests=[], shards=[])
+    scope = "this step" if len(results) == 1 else f"batch {','.join(r['id'] for r in results)}"
+    failed_tests = [t for shard in validation["shards"] if not shard["ok"] for t in shard["tests"]]
+    for r in ok_steps:
+        r["validation"] = validation
+        if validation["status"] == "cancelled":
+            # Unvalidated work is not "ok"; this also keeps it out of the step-cost history.
+            r["status"] = "cancelled"
+        elif validation["status"] == "failed":
+            r["status"] = "failed"
+            r["output"] = (
+                f"{r['output']}\n\n[validation]\nImpacted tests failed after {scope}: "
+                f"{', '.join(failed_tests)}; treating this step as failed."
+            )
+
+
+def admit_parallel_workers(count: int, policy: ResourcePolicy) -> int:
+    """Cap batch concurrency so admitted steps fit in currently available memory."""
+    workers = min(MAX_PARALLEL_STEPS, count)
+    available = available_memory_mb()
+    if available is None:
+        return workers
+    per_step = policy.max_memory_mb or DEFAULT_STEP_MEMORY_MB
+    budget = int((available - policy.min_free_memory_mb) // per_step)
+    # Always admit one step so the run makes progress even on a busy host.
+    return max(1, min(workers, budget))
+
+
 def run_node(state: OrchestratorState) -> dict[str, Any]:
     active = state["active_steps"]
     if not active:
@@ -498,29 +1517,41 @@ def run_node(state: OrchestratorState) -> dict[str, Any]:
     task = state["task"]
     completed = list(state["completed_steps"])
     results: list[CompletedStep] = []
-    verbose = state.get("verbose", True)
+    policy = state["resource_policy"]
+    validate = state.get("validate", "off")
+    cancel = state["cancel"]
 
+    before = worktree_snapshot() if validate == "impacted" else None
     if len(active) == 1:
         step = active[0]
-        if verbose:
-            print(f"[run] {step['id']} tool={step['tool']} mode=single", flush=True)
-        results.append(run_one_step(task, step, completed))
+        report(state, f"[run] {step['id']} tool={step['tool']} mode=single")
+        results.append(run_one_step(task, step, completed, policy, cancel))
     else:
-        if verbose:
-            print(
-                f"[run] batch={','.join(s['id'] for s in active)} mode=parallel",
-                flush=True,
-            )
-        with ThreadPoolExecutor(max_workers=min(4, len(active))) as pool:
-            futures = {
-                pool.submit(run_one_step, task, step, completed): step["id"] for step in active
+        workers = admit_parallel_workers(len(active), policy)
+        report(state, f"[run] batch={','.join(s['id'] for s in active)} mode=parallel workers={workers}")
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending: set[Future] = {
+                pool.submit(run_one_step, task, step, completed, policy, cancel) for step in active
             }
-            for fut in as_completed(futures):
-                results.append(fut.result())
-
-    if verbose:
-        for r in results:
-            print(f"[done] {r['id']} status={r['status']} tool={r['tool']}", flush=True)
+            # Poll instead of blocking so the main thread keeps handling Ctrl-C.
+            while pending:
+                done, pending = wait(pending, timeout=RESOURCE_POLL_SEC, return_when=FIRST_COMPLETED)
+                results.extend(fut.result() for fut in done)
+    if before is not None:
+        validate_batch(results, before, policy, cancel)
+
+    for r in results:
+        report(
+            state,
+            f"[done] {r['id']} status={r['status']} tool={r['tool']} "
+            f"elapsed={r['elapsed_sec']:.1f}s cpu={r['cpu_sec']:.1f}s peak_rss={r['peak_rss_mb']:.0f}MB",
+        )
+        if r["validation"] is not None:
+            report(
+                state,
+                f"[validate] {r['id']} {r['validation']['status']} "
+                f"changed={len(r['validation']['changed_files'])} tests={len(r['validation']['tests'])}",
+            )
 
     return {
         "completed_steps": completed + results,
@@ -530,11 +1561,12 @@ def run_node(state: OrchestratorState) -> dict[str, Any]:
 
 
 def route_after_pick(state: OrchestratorState) -> str:
-    if state["status"] in {"done", "error"}:
+    if state["status"] in {"done", "error", "cancelled"}:
         return "end"
     return "run"
 
 
+@functools.lru_cache(maxsize=1)
 def build_graph():
     graph = StateGraph(OrchestratorState)
     graph.add_node("plan", plan_node)
@@ -552,7 +1584,18 @@ def print_summary(state: OrchestratorState) -> None:
     print("=== Orchestration Summary ===", flush=True)
     print(f"status: {state['status']}", flush=True)
     for step in state["completed_steps"]:
-        print(f"- {step['id']} [{step['tool']}] {step['status']} :: {step['title']}", flush=True)
+        print(
+            f"- {step['id']} [{step['tool']}] {step['status']} :: {step['title']} "
+            f"(elapsed={step['elapsed_sec']:.1f}s cpu={step['cpu_sec']:.1f}s peak_rss={step['peak_rss_mb']:.0f}MB)",
+            flush=True,
+        )
+        validation = step.get("validation")
+        if validation:
+            print(f"    validation: {validation['status']} ({len(validation['tests'])} impacted tests)", flush=True)
+    completed_ids = {s["id"] for s in state["completed_steps"]}
+    for step in state["plan"]:
+        if step["id"] not in completed_ids:
+            print(f"- {step['id']} [{step['tool']}] not started :: {step['title']}", flush=True)
     print("", flush=True)
     print("=== Final Outputs ===", flush=True)
     for step in state["completed_steps"]:
@@ -569,6 +1612,27 @@ def collect_outputs_text(state: OrchestratorState) -> str:
     return "\n\n".join(parts).strip()
 
 
+@contextmanager
+def interrupt_cancels(cancel: CancelToken, *, verbose: bool):
+    """Turn the first Ctrl-C into a cooperative cancel; a second one aborts immediately."""
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def handler(signum: int, frame: Any) -> None:
+        if cancel.cancelled:
+            raise KeyboardInterrupt
+        if verbose:
+            print("\n[cancel] Interrupt received, stopping tool processes (Ctrl-C again to abort).", flush=True)
+        cancel.cancel("interrupted")
+
+    previous = signal.signal(signal.SIGINT, handler)
+    try:
+        yield
+    finally:
+        signal.signal(signal.SIGINT, previous)
+
+
 def run_orchestration(
     task: str,
     *,
@@ -576,7 +1640,17 @@ def run_orchestration(
     forced_strategy: str,
     max_iterations: int,
     verbose: bool,
+    resource_policy: ResourcePolicy | None = None,
+    progress: Callable[[str], None] | None = None,
+    planners: list[str] | None = None,
+    plan_deadline_sec: float = 180.0,
+    validate: str = "off",
+    deadline_sec: float = 0.0,
+    cancel: CancelToken | None = None,
 ) -> OrchestratorState:
+    cancel = cancel or CancelToken()
+    if deadline_sec > 0:
+        cancel.set_deadline(deadline_sec)
     init_state: OrchestratorState = {
         "task": task,
         "forced_tool": forced_tool,
@@ -589,9 +1663,19 @@ def run_orchestration(
         "max_iterations": max_iterations,
         "log": [],
         "verbose": verbose,
+        "resource_policy": resource_policy or ResourcePolicy(),
+        "progress": progress,
+        "planners": planners or ["codex"],
+        "plan_deadline_sec": plan_deadline_sec,
+        "validate": validate,
+        "cancel": cancel,
     }
     app = build_graph()
-    return app.invoke(init_state)
+    with interrupt_cancels(cancel, verbose=verbose):
+        final_state = app.invoke(init_state)
+    if ACTIVE_CASSETTE is None or not ACTIVE_CASSETTE.replaying:
+        record_step_costs(final_state["completed_steps"])
+    return final_state
 
 
 def build_chat_task(
@@ -649,6 +1733,7 @@ def chat_loop(
     max_iterations: int,
     history_turns: int,
     initial_message: str,
+    run_options: dict[str, Any] | None = None,
 ) -> int:
     current_tool = forced_tool
     current_strategy = forced_strategy
@@ -718,6 +1803,7 @@ def chat_loop(
             forced_strategy=current_strategy,
             max_iterations=max_iterations,
             verbose=True,
+            **(run_options or {}),
         )
         print_summary(final_state)
 
@@ -729,6 +1815,506 @@ def chat_loop(
         history.append(("assistant", assistant_text))
 
 
+def state_to_json(state: OrchestratorState) -> dict[str, Any]:
+    return {
+        "task": state["task"],
+        "status": state["status"],
+        "plan": state["plan"],
+        "completed_steps": state["completed_steps"],
+        "log": state["log"],
+    }
+
+
+@dataclass
+class DaemonJob:
+    id: str
+    task: str
+    forced_tool: str
+    forced_strategy: str
+    max_iterations: int
+    priority: int
+    status: str = "queued"
+    submitted_at: float = field(default_factory=time.time)
+    finished_at: float = 0.0
+    events: list[str] = field(default_factory=list)
+    result: dict[str, Any] | None = None
+    cancel_token: CancelToken = field(default_factory=CancelToken)
+
+    def to_json(self, *, include_result: bool = False) -> dict[str, Any]:
+        data: dict[str, Any] = {
+            "id": self.id,
+            "task": self.task,
+            "tool": self.forced_tool,
+            "strategy": self.forced_strategy,
+            "priority": self.priority,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "finished_at": self.finished_at,
+        }
+        if include_result:
+            data["result"] = self.result
+        return data
+
+
+class OrchestratorDaemon:
+    """Shared priority queue of orchestration jobs executed by a fixed worker pool."""
+
+    def __init__(self, *, workers: int, run_options: dict[str, Any]) -> None:
+        self.workers = max(1, workers)
+        self.run_options = run_options
+        self._cond = threading.Condition()
+        self._queue: list[tuple[int, int, str]] = []
+        self._jobs: dict[str, DaemonJob] = {}
+        self._seq = itertools.count()
+        self._threads: list[threading.Thread] = []
+        self._stopping = False
+
+    def start(self) -> None:
+        for idx in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"orchestrator-worker-{idx}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def shutdown(self, reason: str, timeout_sec: float) -> None:
+        """Cancel queued and running jobs, then wait up to `timeout_sec` for the workers to drain.
+
+        Tools run in their own session, so the terminal's Ctrl-C never reaches
+        them; without this they would outlive the daemon.
+        """
+        with self._cond:
+            self._stopping = True
+            for job in list(self._jobs.values()):
+                if job.status == "queued":
+                    self._finish(job, "cancelled", None)
+                elif job.status == "running":
+                    job.cancel_token.cancel(reason)
+                    job.events.append(f"[daemon] {reason}")
+            self._cond.notify_all()
+        deadline = time.monotonic() + timeout_sec
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        stuck = sum(1 for thread in self._threads if thread.is_alive())
+        if stuck:
+            print(f"[daemon] {stuck} worker(s) still running after {timeout_sec:.0f}s", flush=True)
+
+    def submit(self, payload: dict[str, Any]) -> DaemonJob:
+        task = str(payload.get("task") or "").strip()
+        if not task:
+            raise ValueError("task is empty")
+        tool = str(payload.get("tool") or "auto").strip().lower()
+        if tool not in {"auto", "codex", "claude", "agent"}:
+            raise ValueError("tool must be auto|codex|claude|agent")
+        strategy = str(payload.get("strategy") or "auto").strip().lower()
+        if strategy not in {"auto", "sequential", "parallel"}:
+            raise ValueError("strategy must be auto|sequential|parallel")
+        job = DaemonJob(
+            id=uuid.uuid4().hex[:12],
+            task=task,
+            forced_tool=tool,
+            forced_strategy=strategy,
+            max_iterations=int(payload.get("max_iterations") or 8),
+            priority=int(payload.get("priority") or 0),
+        )
+        with self._cond:
+            self._jobs[job.id] = job
+            # Higher priority first, FIFO within the same priority.
+            heapq.heappush(self._queue, (-job.priority, next(self._seq), job.id))
+            position = sum(1 for j in self._jobs.values() if j.status == "queued")
+            job.events.append(f"[daemon] queued priority={job.priority} position={position}")
+            self._cond.notify_all()
+        print(f"[daemon] queued {job.id} priority={job.priority}", flush=True)
+        return job
+
+    def get(self, job_id: str) -> DaemonJob | None:
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> list[DaemonJob]:
+        with self._cond:
+            return sorted(self._jobs.values(), key=lambda j: j.submitted_at)
+
+    def stats(self) -> dict[str, int]:
+        with self._cond:
+            statuses = [j.status for j in self._jobs.values()]
+        return {"queued": statuses.count("queued"), "running": statuses.count("running"), "workers": self.workers}
+
+    def cancel(self, job_id: str) -> tuple[bool, str]:
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return False, "unknown job"
+            if job.status == "queued":
+                self._finish(job, "cancelled", None)
+                return True, "cancelled"
+            if job.status == "running":
+                job.cancel_token.cancel("cancelled via API")
+                job.events.append("[daemon] cancel requested")
+                self._cond.notify_all()
+                return True, "cancelling"
+            return False, f"job already {job.status}"
+
+    def wait_events(self, job_id: str, offset: int, timeout_sec: float) -> tuple[list[str], bool]:
+        """Block until the job has events past `offset` or finishes."""
+        with self._cond:
+            job = self._jobs[job_id]
+            self._cond.wait_for(
+                lambda: len(job.events) > offset or job.status not in {"queued", "running"},
+                timeout=timeout_sec,
+            )
+            return job.events[offset:], job.status not in {"queued", "running"}
+
+    def _finish(self, job: DaemonJob, status: str, result: dict[str, Any] | None) -> None:
+        # Caller holds self._cond.
+        job.status = status
+        job.result = result
+        job.finished_at = time.time()
+        job.events.append(f"[daemon] finished status={status}")
+        self._cond.notify_all()
+        finished = [j for j in self._jobs.values() if j.finished_at]
+        for old in sorted(finished, key=lambda j: j.finished_at)[:-MAX_FINISHED_JOBS]:
+            self._jobs.pop(old.id, None)
+
+    def _append_event(self, job: DaemonJob, line: str) -> None:
+        with self._cond:
+            job.events.append(line)
+            self._cond.notify_all()
+
+    def _next_job(self) -> DaemonJob | None:
+        with self._cond:
+            while not self._stopping:
+                while self._queue:
+                    _, _, job_id = heapq.heappop(self._queue)
+                    job = self._jobs.get(job_id)
+                    if job is not None and job.status == "queued":
+                        job.status = "running"
+                        job.events.append("[daemon] started")
+                        self._cond.notify_all()
+                        return job
+                self._cond.wait()
+            return None
+
+    def _worker_loop(self) -> None:
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            print(f"[daemon] running {job.id}", flush=True)
+            try:
+                final_state = run_orchestration(
+                    job.task,
+                    forced_tool=job.forced_tool,
+                    forced_strategy=job.forced_strategy,
+                    max_iterations=job.max_iterations,
+                    verbose=False,
+                    progress=functools.partial(self._append_event, job),
+                    cancel=job.cancel_token,
+                    **self.run_options,
+                )
+                status = final_state["status"]
+                result = state_to_json(final_state)
+            except Exception as exc:  # pragma: no cover - defensive
+                status = "error"
+                result = {"task": job.task, "status": "error", "plan": [], "completed_steps": [], "log": [str(exc)]}
+            with self._cond:
+                self._finish(job, status, result)
+            print(f"[daemon] finished {job.id} status={status}", flush=True)
+
+
+def is_loopback_host(host: str) -> bool:
+    host = host.strip().strip("[]").lower()
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def daemon_token_path(port: int) -> Path:
+    return STATE_DIR / f"daemon-{port}.token"
+
+
+def write_daemon_token(port: int) -> str:
+    token = secrets.token_urlsafe(32)
+    STATE_DIR.mkdir(parents=True, exist_ok=True)
+    path = daemon_token_path(port)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+        fh.write(token)
+    return token
+
+
+def read_daemon_token(base_url: str) -> str:
+    token = os.environ.get("AI_ORCHESTRATOR_TOKEN", "").strip()
+    if token:
+        return token
+    port = urllib.parse.urlsplit(base_url).port or 80
+    try:
+        return daemon_token_path(port).read_text(encoding="utf-8").strip()
+    except OSError:
+        return ""
+
+
+class DaemonRequestHandler(BaseHTTPRequestHandler):
+    server: DaemonHTTPServer
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - stdlib signature
+        pass
+
+    def _authorize(self, *, needs_json: bool) -> bool:
+        """Reject anything a web page could forge: foreign Host/Origin, non-JSON bodies, missing token."""
+        host = urllib.parse.urlsplit("//" + (self.headers.get("Host") or "")).hostname or ""
+        origin = self.headers.get("Origin")
+        if not is_loopback_host(host):
+            self._send_json(403, {"error": "host not allowed"})
+            return False
+        if origin is not None and not is_loopback_host(urllib.parse.urlsplit(origin).hostname or ""):
+            self._send_json(403, {"error": "origin not allowed"})
+            return False
+        content_type = (self.headers.get("Content-Type") or "").split(";", 1)[0].strip().lower()
+        if needs_json and content_type != "application/json":
+            self._send_json(415, {"error": "Content-Type must be application/json"})
+            return False
+        token = self.headers.get(DAEMON_TOKEN_HEADER) or ""
+        if not hmac.compare_digest(token.encode("utf-8"), self.server.token.encode("utf-8")):
+            self._send_json(401, {"error": "missing or invalid token"})
+            return False
+        return True
+
+    def _send_json(self, code: int, payload: Any) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b"{}"
+        payload = json.loads(raw.decode("utf-8") or "{}")
+        if not isinstance(payload, dict):
+            raise ValueError("body must be a JSON object")
+        return payload
+
+    def _route(self) -> tuple[str, DaemonJob | None, str]:
+        parts = [p for p in self.path.split("?", 1)[0].split("/") if p]
+        if len(parts) >= 2 and parts[0] == "tasks":
+            job = self.server.orchestrator.get(parts[1])
+            return "tasks", job, "/".join(parts[2:])
+        return "/".join(parts), None, ""
+
+    def do_GET(self) -> None:  # noqa: N802 - stdlib naming
+        if not self._authorize(needs_json=False):
+            return
+        daemon = self.server.orchestrator
+        resource_name, job, action = self._route()
+        if resource_name == "health":
+            self._send_json(200, {"ok": True, **daemon.stats()})
+            return
+        if resource_name == "tasks" and job is None and self.path.rstrip("/") == "/tasks":
+            self._send_json(200, [j.to_json() for j in daemon.list_jobs()])
+            return
+        if resource_name != "tasks" or job is None:
+            self._send_json(404, {"error": "not found"})
+            return
+        if action == "":
+            self._send_json(200, job.to_json(include_result=True))
+            return
+        if action == "events":
+            self._stream_events(job)
+            return
+        self._send_json(404, {"error": "not found"})
+
+    def do_POST(self) -> None:  # noqa: N802 - stdlib naming
+        if not self._authorize(needs_json=True):
+            return
+        daemon = self.server.orchestrator
+        resource_name, job, action = self._route()
+        if self.path.rstrip("/") == "/tasks":
+            try:
+                new_job = daemon.submit(self._read_json())
+            except (ValueError, json.JSONDecodeError) as exc:
+                self._send_json(400, {"error": str(exc)})
+                return
+            self._send_json(202, new_job.to_json())
+            return
+        if resource_name == "tasks" and job is not None and action == "cancel":
+            ok, message = daemon.cancel(job.id)
+            self._send_json(200 if ok else 409, {"id": job.id, "cancelled": ok, "message": message})
+            return
+        self._send_json(404, {"error": "not found"})
+
+    def _stream_events(self, job: DaemonJob) -> None:
+        # HTTP/1.0 response without Content-Length: NDJSON lines until the job ends.
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.end_headers()
+        offset = 0
+        while True:
+            events, finished = self.server.orchestrator.wait_events(job.id, offset, timeout_sec=15.0)
+            lines = [{"event": "progress", "line": line} for line in events]
+            offset += len(events)
+            if finished:
+                lines.append({"event": "end", "status": job.status})
+            try:
+                for item in lines:
+                    self.wfile.write((json.dumps(item, ensure_ascii=False) + "\n").encode("utf-8"))
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                return
+            if finished:
+                return
+
+
+class DaemonHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], daemon: OrchestratorDaemon, token: str) -> None:
+        if ":" in address[0]:
+            self.address_family = socket.AF_INET6
+        super().__init__(address, DaemonRequestHandler)
+        self.orchestrator = daemon
+        self.token = token
+
+
+def serve_daemon(
+    *,
+    host: str,
+    port: int,
+    workers: int,
+    max_tools: int,
+    run_options: dict[str, Any],
+) -> int:
+    if not is_loopback_host(host):
+        print(f"[daemon] refusing to bind non-loopback address {host}; use 127.0.0.1, ::1 or localhost.", flush=True)
+        return 1
+    if run_options.get("validate", "off") != "off" and workers > 1:
+        # Jobs share one worktree, so one job's edits would be validated against another's.
+        print("[daemon] --validate needs an exclusive worktree; running one job at a time.", flush=True)
+        workers = 1
+    global TOOL_SLOTS
+    TOOL_SLOTS = threading.BoundedSemaphore(max(1, max_tools))
+    daemon = OrchestratorDaemon(workers=workers, run_options=run_options)
+    server = DaemonHTTPServer((host, port), daemon, write_daemon_token(port))
+    daemon.start()
+    print(
+        f"[daemon] listening on http://{host}:{port} workers={daemon.workers} max_tools={max(1, max_tools)} "
+        f"token={daemon_token_path(port).relative_to(REPO_ROOT).as_posix()}",
+        flush=True,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n[daemon] Interrupted, cancelling jobs and shutting down.", flush=True)
+        return 130
+    finally:
+        daemon.shutdown("daemon shutdown", DAEMON_SHUTDOWN_SEC)
+        server.server_close()
+    return 0
+
+
+def daemon_request(
+    base_url: str,
+    method: str,
+    path: str,
+    payload: dict[str, Any] | None = None,
+    *,
+    timeout_sec: float | None = 30,
+):
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    req = urllib.request.Request(
+        base_url.rstrip("/") + path,
+        data=data,
+        method=method,
+        headers={"Content-Type": "application/json", DAEMON_TOKEN_HEADER: read_daemon_token(base_url)},
+    )
+    return urllib.request.urlopen(req, timeout=timeout_sec)
+
+
+def daemon_json(base_url: str, method: str, path: str, payload: dict[str, Any] | None = None) -> dict[str, Any]:
+    """Call the daemon API; transport and HTTP failures come back as {"error": ...}."""
+    try:
+        with daemon_request(base_url, method, path, payload) as resp:
+            body = resp.read().decode("utf-8", errors="replace")
+    except urllib.error.HTTPError as exc:
+        body = exc.read().decode("utf-8", errors="replace")
+        try:
+            reply = json.loads(body or "{}")
+        except ValueError:
+            reply = None
+        if isinstance(reply, dict):
+            reply.setdefault("error", f"HTTP {exc.code}")
+            return reply
+        return {"error": f"HTTP {exc.code}: {body.strip()[:200] or exc.reason}"}
+    except urllib.error.URLError as exc:
+        return {"error": f"daemon not reachable at {base_url}: {exc.reason}"}
+    except (OSError, http.client.HTTPException) as exc:
+        return {"error": f"daemon connection failed: {exc}"}
+    try:
+        reply = json.loads(body)
+    except ValueError:
+        return {"error": f"invalid daemon response: {body.strip()[:200]}"}
+    return reply if isinstance(reply, dict) else {"error": "invalid daemon response"}
+
+
+def client_cancel(base_url: str, job_id: str) -> int:
+    reply = daemon_json(base_url, "POST", f"/tasks/{job_id}/cancel")
+    print(f"[client] {job_id}: {reply.get('message') or reply.get('error')}", flush=True)
+    return 0 if reply.get("cancelled") else 1
+
+
+def client_run(
+    base_url: str,
+    task: str,
+    *,
+    forced_tool: str,
+    forced_strategy: str,
+    max_iterations: int,
+    priority: int,
+) -> int:
+    job = daemon_json(
+        base_url,
+        "POST",
+        "/tasks",
+        {
+            "task": task,
+            "tool": forced_tool,
+            "strategy": forced_strategy,
+            "max_iterations": max_iterations,
+            "priority": priority,
+        },
+    )
+    if "id" not in job:
+        print(f"[client] submit failed: {job.get('error')}", flush=True)
+        return 1
+
+    job_id = job["id"]
+    print(f"[client] submitted {job_id} to {base_url}", flush=True)
+    try:
+        with daemon_request(base_url, "GET", f"/tasks/{job_id}/events", timeout_sec=None) as stream:
+            for raw in stream:
+                item = json.loads(raw.decode("utf-8"))
+                if item.get("event") == "progress":
+                    print(item["line"], flush=True)
+    except KeyboardInterrupt:
+        print("\n[client] Interrupted, requesting cancel.", flush=True)
+        client_cancel(base_url, job_id)
+        return 130
+    except (OSError, ValueError, http.client.HTTPException) as exc:
+        # URLError is an OSError; ValueError covers a truncated NDJSON line.
+        print(f"[client] lost connection to daemon while streaming {job_id}: {exc}", flush=True)
+        return 1
+
+    final = daemon_json(base_url, "GET", f"/tasks/{job_id}")
+    result = final.get("result")
+    if not result:
+        print(f"[client] status: {final.get('status') or final.get('error')}", flush=True)
+        return 1
+    print_summary(result)  # type: ignore[arg-type]
+    return 0 if result["status"] == "done" else 1
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="LangGraph multi-agent orchestrator")
     parser.add_argument("task", nargs="*", help="Task to execute")
@@ -761,9 +2347,150 @@ def main() -> int:
         default=6,
         help="How many recent user/assistant turns to keep in chat context",
     )
+    parser.add_argument(
+        "--step-max-memory-mb",
+        type=int,
+        default=0,
+        help="Kill a step's process tree when its RSS exceeds this (0 = unlimited)",
+    )
+    parser.add_argument(
+        "--step-max-cpu-sec",
+        type=int,
+        default=0,
+        help="Kill a step's process tree when its CPU time exceeds this (0 = unlimited)",
+    )
+    parser.add_argument(
+        "--min-free-memory-mb",
+        type=int,
+        default=1024,
+        help="Host memory to keep free when admitting parallel steps",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run a long-lived orchestrator serving a local HTTP API",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Daemon bind address")
+    parser.add_argument("--port", type=int, default=8765, help="Daemon port")
+    parser.add_argument(
+        "--daemon-workers",
+        type=int,
+        default=1,
+        help="How many queued tasks the daemon runs at once",
+    )
+    parser.add_argument(
+        "--daemon-max-tools",
+        type=int,
+        default=MAX_PARALLEL_STEPS,
+        help="Daemon-wide cap on concurrently running tool processes, shared by all jobs",
+    )
+    parser.add_argument(
+        "--client",
+        action="store_true",
+        help="Submit the task to a running daemon and stream its progress",
+    )
+    parser.add_argument(
+        "--daemon-url",
+        default=os.environ.get("AI_ORCHESTRATOR_URL", DEFAULT_DAEMON_URL),
+        help="Daemon URL for --client/--cancel",
+    )
+    parser.add_argument(
+        "--priority",
+        type=int,
+        default=0,
+        help="Queue priority for --client (higher runs first)",
+    )
+    parser.add_argument("--cancel", metavar="JOB_ID", help="Cancel a queued or running daemon job")
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument(
+        "--record",
+        metavar="CASSETTE",
+        help="Append every tool request/response (with timings) to a JSONL cassette",
+    )
+    cassette_group.add_argument(
+        "--replay",
+        metavar="CASSETTE",
+        help="Answer tool calls from a recorded cassette instead of running tools",
+    )
+    parser.add_argument(
+        "--replay-latency-scale",
+        type=float,
+        default=0.0,
+        help="Sleep recorded tool latency times this factor during --replay (0 = instant)",
+    )
+    parser.add_argument(
+        "--planners",
+        default="codex",
+        help="Comma-separated planner tools; more than one enables ensemble planning",
+    )
+    parser.add_argument(
+        "--plan-deadline",
+        type=float,
+        default=180.0,
+        help="Seconds to wait for ensemble planners before cancelling late responders",
+    )
+    parser.add_argument(
+        "--validate",
+        default="impacted",
+        choices=["impacted", "off"],
+        help="Run tests impacted by each step's changes (import-graph based) or skip validation",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=0.0,
+        help="Run-level time budget in seconds; in-flight tools are killed when it expires (0 = none)",
+    )
     args = parser.parse_args()
 
+    global ACTIVE_CASSETTE
+    if args.record:
+        ACTIVE_CASSETTE = ToolCassette(Path(args.record), replay=False)
+    elif args.replay:
+        replay_path = Path(args.replay)
+        if not replay_path.is_file():
+            print(f"Cassette not found: {replay_path}", flush=True)
+            return 1
+        ACTIVE_CASSETTE = ToolCassette(replay_path, replay=True, latency_scale=args.replay_latency_scale)
+
+    planners = [p.strip().lower() for p in args.planners.split(",") if p.strip()]
+    invalid_planners = [p for p in planners if p not in {"codex", "claude", "agent"}]
+    if invalid_planners:
+        print(f"Invalid --planners: {','.join(invalid_planners)}. Use codex,claude,agent.", flush=True)
+        return 1
+
+    if not process_sampler_available() and not (args.client or args.cancel):
+        if args.step_max_memory_mb > 0 or args.step_max_cpu_sec > 0:
+            print(
+                "--step-max-memory-mb/--step-max-cpu-sec need psutil on this platform: "
+                "install it with ai\\.venv\\Scripts\\python.exe -m pip install psutil",
+                flush=True,
+            )
+            return 1
+        print("[warn] psutil not installed: step peak_rss/cpu will be reported as 0.", flush=True)
+
+    run_options: dict[str, Any] = {
+        "resource_policy": ResourcePolicy(
+            max_memory_mb=max(0, args.step_max_memory_mb),
+            max_cpu_sec=max(0, args.step_max_cpu_sec),
+            min_free_memory_mb=max(0, args.min_free_memory_mb),
+        ),
+        "planners": list(dict.fromkeys(planners)) or ["codex"],
+        "plan_deadline_sec": max(1.0, args.plan_deadline),
+        "validate": args.validate,
+        "deadline_sec": max(0.0, args.deadline),
+    }
     task = " ".join(args.task).strip()
+    if args.daemon:
+        return serve_daemon(
+            host=args.host,
+            port=args.port,
+            workers=args.daemon_workers,
+            max_tools=args.daemon_max_tools,
+            run_options=run_options,
+        )
+    if args.cancel:
+        return client_cancel(args.daemon_url, args.cancel)
     if args.chat:
         return chat_loop(
             forced_tool=args.tool,
@@ -771,20 +2498,34 @@ def main() -> int:
             max_iterations=args.max_iterations,
             history_turns=max(1, args.chat_history_turns),
             initial_message=task,
+            run_options=run_options,
         )
 
     if not task:
         print("Task is empty.", flush=True)
         return 1
 
+    if args.client:
+        return client_run(
+            args.daemon_url,
+            task,
+            forced_tool=args.tool,
+            forced_strategy=args.strategy,
+            max_iterations=args.max_iterations,
+            priority=args.priority,
+        )
+
     final_state = run_orchestration(
         task,
         forced_tool=args.tool,
         forced_strategy=args.strategy,
         max_iterations=args.max_iterations,
         verbose=True,
+        **run_options,
     )
     print_summary(final_state)
+    if final_state["status"] == "cancelled" and final_state["cancel"].reason == "interrupted":
+        return 130
     return 0 if final_state["status"] == "done" else 1
 
 